@@ -1,9 +1,9 @@
 import streamlit as st
-import sympy as sp
 import numpy as np
-import pandas as pd
 import plotly.graph_objects as go
 
+from common import DEFAULT_FUNC, compile_expr, find_valid_bracket, solve
+
 # --- CONFIGURATION ---
 st.set_page_config(page_title="False Position using Exponential", page_icon="🔬", layout="wide")
 
@@ -55,15 +55,79 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# --- AUTO-BRACKETING LOGIC ---
-def find_valid_bracket(f, a, b):
-    search_range = 2.0
-    for _ in range(50): 
-        if f(a) * f(b) < 0:
-            return a, b, True
-        a -= search_range
-        b += search_range
-    return a, b, False
+# --- FULL ANALYSIS ---
+# Lahat ng pure-numeric na steps, cached end-to-end; rendering lang ang nasa labas.
+# Returns (a, b, adjusted, df, steps); df ay None kapag walang nahanap na bracket.
+@st.cache_data(max_entries=64)
+def run_solver(func_input: str, a: float, b: float, tol: float):
+    f_num, f_math = compile_expr(func_input)
+    adjusted = bool(f_num(a) * f_num(b) >= 0)
+    if adjusted:
+        a, b, found = find_valid_bracket(f_num, a, b)
+        if not found:
+            return a, b, True, None, ()
+    df, steps = solve(f_math, a, b, tol)
+    return a, b, adjusted, df, steps
+
+# --- ITERATION TABLE ---
+# Formatting is done by the browser grid, kaya walang per-cell Styler pass sa Python
+TABLE_COLUMNS = {
+    col: st.column_config.NumberColumn(format="%.6f")
+    for col in ("a", "b", "f(a)", "f(b)", "z", "f(z)", "Error%")
+}
+
+# --- CONVERGENCE GRAPH ---
+# Evaluated once per (function, range) in float64. The y values are sent to the chart
+# as float32 (half the payload) only when every finite value fits float32's range.
+@st.cache_data(max_entries=64)
+def plot_grid(func_input: str, lo: float, hi: float):
+    f_num, _ = compile_expr(func_input)
+    x_vals = np.linspace(lo, hi, 200)
+    with np.errstate(over='ignore', invalid='ignore'):
+        y_vals = f_num(x_vals)
+    finite = y_vals[np.isfinite(y_vals)]
+    if finite.size and np.abs(finite).max() <= np.finfo(np.float32).max:
+        y_vals = y_vals.astype(np.float32)
+    return x_vals, y_vals
+
+# Cached on the plotted arrays, kaya hindi na binubuo ulit ang figure kapag pareho ang analysis
+@st.cache_data(max_entries=64)
+def make_fig(x_vals, y_vals, z):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x_vals, y=y_vals, name="f(x)", line=dict(color='#00796b', width=3)))
+    fig.add_hline(y=0, line_dash="dash", line_color="gray")
+    fig.add_trace(go.Scatter(x=[z], y=[0], mode='markers', marker=dict(size=14, color='red'), name="Root"))
+    fig.update_layout(template="plotly_white", title="Convergence Graph (Visual Verification)")
+    return fig
+
+# --- CSV EXPORT ---
+# Cached para hindi na ulit i-serialize sa bawat rerun
+@st.cache_data(max_entries=64)
+def to_csv_bytes(df):
+    return df.to_csv(index=False).encode('utf-8')
+
+# --- STEP-BY-STEP RENDERER ---
+# Fragment para ang toggle ay rerun lang ng tab na ito, hindi ng buong analysis
+@st.fragment
+def render_steps(steps):
+    if not st.toggle("Show long-hand solution", key="show_steps"):
+        return
+    formula = r"$$z = \frac{a \cdot f(b) - b \cdot f(a)}{f(b) - f(a)}$$"
+    cards = [
+        "\n\n".join([
+            '<div class="step-card">',
+            f"#### Iteration {i}",
+            f"**Step 1:** Given $a = {a:.6f}, f(a) = {fa:.6f}$ and $b = {b:.6f}, f(b) = {fb:.6f}$",
+            formula,
+            f"$$z = \\frac{{({a:.4f})({fb:.4f}) - ({b:.4f})({fa:.4f})}}{{{fb:.4f} - ({fa:.4f})}} = {z:.6f}$$",
+            f"**Step 2:** $f(z) = {fz:.8f}$",
+            f"**Result:** Replace {replaced} with z para sa susunod na iteration.",
+            "</div>",
+        ])
+        for i, (a, b, fa, fb, z, fz, replaced) in enumerate(steps, 1)
+    ]
+    # Iisang markdown element para sa lahat ng iteration
+    st.markdown("\n\n".join(cards), unsafe_allow_html=True)
 
 # --- HEADER ---
 st.title("🔬 False Position - Exponential Solver")
@@ -74,7 +138,7 @@ st.write("---")
 with st.container():
     st.markdown("### 📋 System Input Table")
     c1, c2, c3, c4 = st.columns([2, 1, 1, 1])
-    with c1: func_input = st.text_input("Function f(x)", "exp(x) - 20")
+    with c1: func_input = st.text_input("Function f(x)", DEFAULT_FUNC)
     with c2: a_in = st.number_input("Lower Bound (a)", value=2.0, format="%.4f")
     with c3: b_in = st.number_input("Upper Bound (b)", value=3.0, format="%.4f")
     with c4: tol = st.number_input("Tolerance (ε)", value=0.0001, format="%.6f")
@@ -84,71 +148,37 @@ with st.container():
 if run_btn:
     try:
         # Math Setup
-        x_sym = sp.symbols('x')
-        expr = sp.sympify(func_input)
-        f_num = sp.lambdify(x_sym, expr, 'numpy')
-
-        # Check and Auto-Bracket
-        a, b = a_in, b_in
-        is_valid = True
-        if f_num(a) * f_num(b) >= 0:
+        a, b, adjusted, df, detailed_steps = run_solver(func_input, a_in, b_in, tol)
+
+        # Auto-Bracket feedback
+        if adjusted:
             st.warning("⚠️ **No Sign Change:** System is searching for a valid interval automatically...")
-            a, b, found = find_valid_bracket(f_num, a, b)
-            if not found:
+            if df is None:
                 st.error("❌ **Search Failed:** Could not find a root automatically. Please adjust your bounds.")
-                is_valid = False
             else:
                 st.success(f"✅ **Interval Adjusted:** [{a:.2f}, {b:.2f}]")
 
-        if is_valid:
-            data, detailed_steps = [], []
-            z_old = 0
-            
-            for i in range(1, 21): 
-                fa, fb = f_num(a), f_num(b)
-                z = (a * fb - b * fa) / (fb - fa)
-                fz = f_num(z)
-                err = abs((z - z_old)/z)*100 if i > 1 else 100
-                
-                data.append({"Iter": i, "a": a, "b": b, "f(a)": fa, "f(b)": fb, "z": z, "f(z)": fz, "Error%": err})
-                detailed_steps.append({"iter": i, "a": a, "b": b, "fa": fa, "fb": fb, "z": z, "fz": fz})
-
-                if abs(fz) < tol: break
-                if f_num(a) * fz < 0: b = z
-                else: a = z
-                z_old = z
-
-            df = pd.DataFrame(data)
+        if df is not None:
+            last = df.iloc[-1]
+            a, b, z, fz = last["a"], last["b"], last["z"], last["f(z)"]
 
             # --- DISPLAY TABS ---
             tab1, tab2, tab3 = st.tabs(["📊 Analytics & Table", "📝 Step-by-Step Long Hand", "📥 Export"])
 
             with tab1:
                 st.markdown("#### 📑 Iteration Summary Table")
-                st.dataframe(df.style.format("{:.6f}"), use_container_width=True)
+                st.dataframe(df, column_config=TABLE_COLUMNS, use_container_width=True)
                 
                 # Plotly Graph
-                x_vals = np.linspace(a - 1, b + 1, 200)
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(x=x_vals, y=f_num(x_vals), name="f(x)", line=dict(color='#00796b', width=3)))
-                fig.add_hline(y=0, line_dash="dash", line_color="gray")
-                fig.add_trace(go.Scatter(x=[z], y=[0], mode='markers', marker=dict(size=14, color='red'), name="Root"))
-                fig.update_layout(template="plotly_white", title="Convergence Graph (Visual Verification)")
-                st.plotly_chart(fig, use_container_width=True)
+                x_vals, y_vals = plot_grid(func_input, a - 1, b + 1)
+                st.plotly_chart(make_fig(x_vals, y_vals, z), use_container_width=True)
 
             with tab2:
                 st.markdown("### 🖋️ Detailed Mathematical Solution")
-                for s in detailed_steps:
-                    with st.container():
-                        st.markdown(f'<div class="step-card"><h4>Iteration {s["iter"]}</h4>', unsafe_allow_html=True)
-                        st.write(f"**Step 1:** Given $a = {s['a']:.6f}, f(a) = {s['fa']:.6f}$ and $b = {s['b']:.6f}, f(b) = {s['fb']:.6f}$")
-                        st.latex(r"z = \frac{a \cdot f(b) - b \cdot f(a)}{f(b) - f(a)}")
-                        st.latex(f"z = \\frac{{({s['a']:.4f})({s['fb']:.4f}) - ({s['b']:.4f})({s['fa']:.4f})}}{{{s['fb']:.4f} - ({s['fa']:.4f})}} = {s['z']:.6f}")
-                        st.write(f"**Step 2:** $f(z) = {s['fz']:.8f}$")
-                        st.markdown(f"**Result:** Replace {'b' if f_num(s['a'])*s['fz'] < 0 else 'a'} with z para sa susunod na iteration.</div>", unsafe_allow_html=True)
+                render_steps(detailed_steps)
 
             with tab3:
-                st.download_button("📂 Download CSV Report", df.to_csv(index=False).encode('utf-8'), "False_Position_Report.csv", "text/csv")
+                st.download_button("📂 Download CSV Report", to_csv_bytes(df), "False_Position_Report.csv", "text/csv")
 
             # --- THE FINAL ANSWER ---
             st.write("---")
@@ -0,0 +1,123 @@
+import functools
+import linecache
+import re
+
+import sympy as sp
+import numpy as np
+import pandas as pd
+
+# Iisang Symbol para sa buong process, shared ng parser at ng lambdify
+X = sp.Symbol('x')
+
+# --- EXPRESSION PARSER ---
+# Names the fast path may resolve; anything else goes through sympify
+_SAFE_NAMES = {name: getattr(sp, name) for name in (
+    "exp", "log", "ln", "sqrt", "sin", "cos", "tan", "sinh", "cosh", "tanh", "Abs", "pi", "E",
+)}
+_SIMPLE_EXPR = re.compile(r"[A-Za-z0-9_\s.+\-*/()]*")
+_ATTRIBUTE = re.compile(r"\.\s*[A-Za-z_]")
+_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_INTEGER = re.compile(r"(?<![\w.])\d+(?![\w.])")
+
+def _parse(func_input: str):
+    # Plain arithmetic on whitelisted names is evaluated directly against the
+    # SymPy objects, skipping the tokenizer and transformations of sympify
+    if (_SIMPLE_EXPR.fullmatch(func_input) and not _ATTRIBUTE.search(func_input)
+            and set(_NAME.findall(func_input)) <= _SAFE_NAMES.keys() | {"x"}):
+        # Integer literals become sp.Integer so 1/3 stays exact, like sympify
+        src = _INTEGER.sub(r"Integer(\g<0>)", func_input)
+        try:
+            code = compile(src, "<f>", "eval")
+        except SyntaxError:
+            pass
+        else:
+            return sp.sympify(eval(code, {"__builtins__": {}}, {**_SAFE_NAMES, "Integer": sp.Integer, "x": X}))
+    return sp.sympify(func_input, locals={"x": X})
+
+# --- EXPRESSION COMPILER ---
+def _lambdify(expr, modules):
+    f = sp.lambdify(X, expr, modules)
+    # lambdify registers its generated source in linecache; drop it so cached
+    # functions don't keep growing that table for the life of the worker
+    linecache.cache.pop(f.__code__.co_filename, None)
+    return f
+
+def _with_fallback(f_math, f_num):
+    # math raises on overflow, domain errors and division by zero where NumPy returns inf/nan;
+    # evaluate those points through NumPy so the loop keeps the baseline behavior
+    def f(v):
+        try:
+            return f_math(v)
+        except (OverflowError, ValueError, ZeroDivisionError):
+            with np.errstate(all='ignore'):
+                return float(f_num(np.float64(v)))
+    return f
+
+# Returns (f_num, f_math): NumPy version para sa arrays, math version para sa scalars
+@functools.lru_cache(maxsize=128)
+def compile_expr(src: str):
+    expr = _parse(src)
+    if not expr.free_symbols:
+        # Constant lang, hindi na kailangan i-lambdify
+        value = float(expr)
+        return (lambda v: np.full_like(v, value, dtype=float)), (lambda v: value)
+    # The iteration only ever evaluates scalars, where the math module skips
+    # NumPy's ufunc dispatch; anything math lacks falls back to numpy.
+    f_num = _lambdify(expr, 'numpy')
+    return f_num, _with_fallback(_lambdify(expr, ['math', 'numpy']), f_num)
+
+# --- AUTO-BRACKETING LOGIC ---
+def find_valid_bracket(f, a, b, search_range=2.0, steps=50):
+    # Same search as expanding [a, b] by search_range per side up to steps times,
+    # pero isang vectorized na tawag lang sa f bawat side
+    offsets = search_range * np.arange(steps)
+    lo, hi = a - offsets, b + offsets
+    with np.errstate(all='ignore'):
+        hits = np.flatnonzero(f(lo) * f(hi) < 0)
+    if hits.size == 0:
+        return a - steps * search_range, b + steps * search_range, False
+    k = hits[0]
+    return float(lo[k]), float(hi[k]), True
+
+# --- REGULA FALSI SOLVER ---
+MAX_ITER = 20
+
+def solve(f, a, b, tol):
+    # Preallocated columns; sinusulat ng loop ang bawat row in place
+    a_arr, b_arr, fa_arr, fb_arr, z_arr, fz_arr, err_arr = np.empty((7, MAX_ITER))
+    detailed_steps = []
+    z_old = 0
+    # Isang bagong f evaluation lang bawat iteration; reused ang f ng endpoint na naiwan
+    # Loop arithmetic stays in np.float64 like the baseline, kaya ang division by zero
+    # (tol = 0 pagkatapos mahanap ang exact root) ay nagiging inf/nan, hindi exception
+    a, b = np.float64(a), np.float64(b)
+    fa, fb = np.float64(f(a)), np.float64(f(b))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for i in range(MAX_ITER):
+            z = (a * fb - b * fa) / (fb - fa)
+            fz = np.float64(f(z))
+            err = abs((z - z_old)/z)*100 if i > 0 else 100
+
+            # Stored with the step para hindi na i-evaluate ulit ang f(a) sa long-hand tab.
+            # Compare signs directly; fa * fz can underflow to -0.0 and pick the wrong side.
+            replaced = 'b' if (fa < 0 < fz) or (fz < 0 < fa) else 'a'
+
+            a_arr[i], b_arr[i], fa_arr[i], fb_arr[i], z_arr[i], fz_arr[i], err_arr[i] = a, b, fa, fb, z, fz, err
+            detailed_steps.append((a, b, fa, fb, z, fz, replaced))
+            n = i + 1
+
+            if abs(fz) < tol: break
+            if replaced == 'b': b, fb = z, fz
+            else: a, fa = z, fz
+            z_old = z
+
+    df = pd.DataFrame({
+        "Iter": np.arange(1, n + 1), "a": a_arr[:n], "b": b_arr[:n], "f(a)": fa_arr[:n], "f(b)": fb_arr[:n],
+        "z": z_arr[:n], "f(z)": fz_arr[:n], "Error%": err_arr[:n],
+    })
+    return df, tuple(detailed_steps)
+
+# Pre-warm ang default function para mabilis na agad ang unang Run ng bawat worker
+DEFAULT_FUNC = "exp(x) - 20"
+compile_expr(DEFAULT_FUNC)
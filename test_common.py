@@ -0,0 +1,45 @@
+import math
+
+import pytest
+
+from common import compile_expr, find_valid_bracket, solve
+
+
+def test_solve_falls_back_to_numpy_on_math_overflow():
+    # exp(800) overflows math.exp at the lower bound; NumPy gives inf, so f(-800) = -0.5
+    _, f = compile_expr("1/(1+exp(-x)) - 0.5")
+    df, _ = solve(f, -800.0, 1.0, 0.0001)
+    assert len(df) == 8
+    assert abs(df["f(z)"].iloc[-1]) < 0.0001
+    assert math.isclose(df["z"].iloc[-1], 0.0, abs_tol=1e-5)
+
+
+
+def test_solve_with_zero_tolerance_runs_all_iterations():
+    # Exact root sa z = 0 tapos tol = 0: ang Error% division ay nan, hindi ZeroDivisionError
+    _, f = compile_expr("sin(x)")
+    df, _ = solve(f, -1.0, 1.0, 0.0)
+    assert len(df) == 20
+    assert (df["z"] == 0.0).all()
+
+
+def test_math_kernel_falls_back_on_zero_division():
+    _, f = compile_expr("1/x")
+    assert f(0.0) == math.inf
+
+
+@pytest.mark.parametrize("src, a, b, expected", [
+    # Root exactly on an endpoint or a probed point ay dapat mahanap pa rin
+    ("x - 3", 2.0, 3.0, (0.0, 5.0)),
+    ("x**2 - 4", 2.0, 3.0, (0.0, 5.0)),
+    ("exp(x) - 1", 0.0, 1.0, (-2.0, 3.0)),
+    ("exp(x) - 20", 5.0, 6.0, (1.0, 10.0)),
+])
+def test_find_valid_bracket_expands_until_sign_change(src, a, b, expected):
+    f_num, _ = compile_expr(src)
+    assert find_valid_bracket(f_num, a, b) == (*expected, True)
+
+
+def test_find_valid_bracket_reports_failure():
+    f_num, _ = compile_expr("x**2 + 1")
+    assert find_valid_bracket(f_num, 0.0, 1.0) == (-100.0, 101.0, False)